@@ -0,0 +1,121 @@
+"""Export and read standalone answer-key files.
+
+    python answer_key.py mb.txt kte.txt --output answers.key
+    python answer_key.py --key answers.key "UPDATE operatorini vazifasi?"
+
+An answer key maps the fingerprint of each normalized full question to the
+text of its correct ("#") option. The file is binary and needs no bank:
+
+    b"BHAK" | version u32 | count u32 | fingerprints u64[count] (sorted)
+    | answer end offsets u32[count] | UTF-8 answers
+"""
+import argparse
+import logging
+import struct
+import sys
+from array import array
+
+import bank_index
+
+
+MAGIC = b"BHAK"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+
+def collect_answers(bank_paths):
+    """Return {fingerprint: answer} for every answered question in the banks"""
+    answers = {}
+    conflicts = 0
+    for path in bank_paths:
+        index = bank_index.load_index(path)
+        for key, record_ids in index.exact_records.items():
+            for record_id in record_ids:
+                answer = index.answer(record_id)
+                if answer is None:
+                    continue
+                if answers.setdefault(key, answer) != answer:
+                    conflicts += 1
+    if conflicts:
+        logging.warning(f"{conflicts} question(s) have conflicting answers; kept the first")
+    return answers
+
+
+def write_answer_key(answers, path):
+    fingerprints = array("Q", sorted(answers))
+    offsets = array("I")
+    blob = bytearray()
+    for key in fingerprints:
+        blob += answers[key].encode("utf-8")
+        offsets.append(len(blob))
+    if sys.byteorder != "little":
+        fingerprints.byteswap()
+        offsets.byteswap()
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(fingerprints)))
+        file.write(fingerprints.tobytes())
+        file.write(offsets.tobytes())
+        file.write(blob)
+
+
+class AnswerKey:
+    """Question -> answer lookups from an exported answer-key file"""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} answer key")
+
+        start = HEADER.size
+        fingerprints = array("Q", data[start:start + 8 * count])
+        start += 8 * count
+        self.offsets = array("I", data[start:start + 4 * count])
+        if sys.byteorder != "little":
+            fingerprints.byteswap()
+            self.offsets.byteswap()
+        self.blob = data[start + 4 * count:]
+        self.positions = {key: i for i, key in enumerate(fingerprints)}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def get(self, question):
+        """The answer to an exact full question, or None"""
+        i = self.positions.get(bank_index.fingerprint(question))
+        if i is None:
+            return None
+        start = self.offsets[i - 1] if i else 0
+        return self.blob[start:self.offsets[i]].decode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or query a compact answer key")
+    parser.add_argument("args", nargs="*", help="bank files to export, or questions with --key")
+    parser.add_argument("--output", default="answers.key", help="answer-key file to write")
+    parser.add_argument("--key", help="answer-key file to look questions up in")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
+    )
+
+    if args.key:
+        key = AnswerKey(args.key)
+        for question in args.args:
+            answer = key.get(question)
+            print(f"{question}\t{answer if answer is not None else '-'}")
+        return 0
+
+    answers = collect_answers(args.args or ["mb.txt"])
+    write_answer_key(answers, args.output)
+    print(f"Wrote {len(answers)} answers to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,573 @@
+import bisect
+import hashlib
+import logging
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from collections import namedtuple
+
+
+logger = logging.getLogger(__name__)
+
+# Bank file layout: records separated by a line of "+" signs, the question
+# followed by options separated by "====", the correct option prefixed "#".
+RECORD_SEPARATOR = re.compile(r"^[ \t]*\+{4,}[ \t]*$", re.MULTILINE)
+OPTION_SEPARATOR = re.compile(r"^[ \t]*={4,}[ \t]*$", re.MULTILINE)
+ANSWER_MARKER = "#"
+
+# Suffixes are sorted by their first SUFFIX_KEY_LENGTH bytes only; longer
+# selections are narrowed with a startswith() check on the candidate range.
+SUFFIX_KEY_LENGTH = 64
+QUESTION_SEPARATOR = b"\n"
+
+_APOSTROPHES = str.maketrans({c: "'" for c in "’‘`ʻʼ′´"})
+_WHITESPACE = re.compile(r"\s+")
+
+# Compiled index files hold one or more BankIndex objects as raw arrays, so
+# loading one never runs code from the file:
+#
+#     b"BHIX" | version u32 | bank count u32
+#     per bank: name length u32 | UTF-8 name | mtime_ns i64 | size i64
+#               | per _INDEX_ARRAYS entry: item count u32 | little-endian items
+#
+# build_bank.py writes BUNDLED_INDEX for the executable; loose bank files get
+# a "<bank>.idx" build cache next to them, whose mtime_ns and size identify
+# the bank file it was built from (-1 when unknown).
+INDEX_MAGIC = b"BHIX"
+INDEX_FORMAT_VERSION = 6
+INDEX_SUFFIX = ".idx"
+BUNDLED_INDEX = "bank.idx"
+_INDEX_HEADER = struct.Struct("<4sII")
+_BANK_HEADER = struct.Struct("<qq")
+_COUNT = struct.Struct("<I")
+# BankIndex attribute and array typecode; "fingerprints" is exact_records
+# flattened to one question fingerprint per record
+_INDEX_ARRAYS = (
+    ("data", "B"),
+    ("field_offsets", "I"),
+    ("record_fields", "I"),
+    ("answers", "b"),
+    ("canonical", "I"),
+    ("fingerprints", "Q"),
+    ("text", "B"),
+    ("starts", "I"),
+    ("suffixes", "I"),
+)
+
+Record = namedtuple("Record", ["question", "options", "answer"])
+
+
+def normalize_text(text):
+    """Normalize text for matching: case, apostrophe variants and whitespace"""
+    text = unicodedata.normalize("NFKC", text).translate(_APOSTROPHES).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint(question):
+    """64-bit fingerprint of a normalized full question"""
+    digest = hashlib.blake2b(normalize_text(question).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def answer_text(option):
+    """Strip the answer marker from the correct option"""
+    return option[len(ANSWER_MARKER):].strip()
+
+
+def _strip_span(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def bank_spans(raw_text):
+    """Yield, per record, the (start, end) spans of its question and options"""
+    chunk_start = 0
+    separators = [match.span() for match in RECORD_SEPARATOR.finditer(raw_text)]
+    for chunk_end, next_start in separators + [(len(raw_text), len(raw_text))]:
+        spans = []
+        field_start = chunk_start
+        for match in OPTION_SEPARATOR.finditer(raw_text, chunk_start, chunk_end):
+            spans.append(_strip_span(raw_text, field_start, match.start()))
+            field_start = match.end()
+        spans.append(_strip_span(raw_text, field_start, chunk_end))
+
+        # Drop empty options, keep the question slot even if it is empty
+        spans = spans[:1] + [span for span in spans[1:] if span[0] < span[1]]
+        if any(start < end for start, end in spans):
+            yield spans
+        chunk_start = next_start
+
+
+def parse_bank(raw_text):
+    """Split raw bank text into Record tuples"""
+    raw_text = raw_text.lstrip("\ufeff")
+    records = []
+    for spans in bank_spans(raw_text):
+        question, *options = [raw_text[start:end] for start, end in spans]
+        records.append(Record(question, options, _answer_position(options)))
+    return records
+
+
+def _answer_position(options):
+    return next(
+        (i for i, option in enumerate(options) if option.startswith(ANSWER_MARKER)),
+        -1,
+    )
+
+
+def format_record(record):
+    """Render a record for display: question first, then one option per line"""
+    return "\n".join([record.question] + record.options)
+
+
+class BankIndex:
+    """Substring index over the normalized question text of a bank file.
+
+    The bank is kept as one UTF-8 buffer (``data``) with offset arrays for its
+    fields: record i spans fields ``record_fields[i]:record_fields[i + 1]``,
+    the first being the question, and field j is
+    ``data[field_offsets[2 * j]:field_offsets[2 * j + 1]]``. Records are only
+    decoded when displayed.
+
+    A selection that is exactly a full question is answered from
+    ``exact_records`` (question fingerprint -> record ids) in O(1). Otherwise
+    every character start of the normalized, UTF-8 encoded questions is a
+    suffix in a sorted suffix array, so a selection that starts or ends
+    mid-word still resolves to its records with two binary searches.
+    """
+
+    def __init__(self, raw_text, path=None):
+        self.path = path
+        self.source_signature = None
+        self._case_folds = None
+        raw_text = raw_text.lstrip("\ufeff")
+
+        self.record_fields = array("I", [0])
+        self.field_offsets = array("I")
+        self.answers = array("b")
+        questions = []
+        char_offset = byte_offset = 0
+        for spans in bank_spans(raw_text):
+            for start, end in spans:
+                # Spans arrive in increasing order: convert to byte offsets incrementally
+                byte_offset += len(raw_text[char_offset:start].encode("utf-8"))
+                self.field_offsets.append(byte_offset)
+                byte_offset += len(raw_text[start:end].encode("utf-8"))
+                self.field_offsets.append(byte_offset)
+                char_offset = end
+            self.record_fields.append(self.record_fields[-1] + len(spans))
+            question, options = raw_text[slice(*spans[0])], [raw_text[slice(*span)] for span in spans[1:]]
+            self.answers.append(_answer_position(options))
+            questions.append(normalize_text(question).encode("utf-8"))
+        self.data = raw_text.encode("utf-8")
+
+        self.exact_records = {}
+        for record_id, question in enumerate(questions):
+            key = fingerprint(question.decode("utf-8"))
+            self.exact_records[key] = self.exact_records.get(key, ()) + (record_id,)
+
+        # canonical[i] is the first record with the same question and answer as
+        # record i, so repeated copies never take more than one result slot
+        self.canonical = array("I", range(len(questions)))
+        for record_ids in self.exact_records.values():
+            first_by_answer = {}
+            for record_id in record_ids:
+                answer = self.answer(record_id)
+                self.canonical[record_id] = first_by_answer.setdefault(answer, record_id)
+
+        self.starts = array("I")
+        offset = 0
+        for question in questions:
+            self.starts.append(offset)
+            offset += len(question) + len(QUESTION_SEPARATOR)
+        self.text = QUESTION_SEPARATOR.join(questions)
+
+        # Index every UTF-8 character start (not continuation bytes 0x80-0xBF)
+        text = self.text
+        separator = QUESTION_SEPARATOR[0]
+        positions = [i for i, byte in enumerate(text) if byte != separator and not 0x80 <= byte < 0xC0]
+        positions.sort(key=lambda i: text[i:i + SUFFIX_KEY_LENGTH])
+        self.suffixes = array("I", positions)
+        logger.info(
+            f"Indexed {len(self)} record(s), {len(self.suffixes)} suffixes"
+            + (f" from {path}" if path else "")
+        )
+
+    def __len__(self):
+        return len(self.answers)
+
+    def lookup_exact(self, selection):
+        """Return ids of records whose full question is the selection"""
+        record_ids = self.exact_records.get(fingerprint(selection), ())
+        return [record_id for record_id in record_ids if self.canonical[record_id] == record_id]
+
+    def answer(self, record_id):
+        """The correct option of a record, without its marker, or None"""
+        position = self.answers[record_id]
+        if position < 0:
+            return None
+        return answer_text(self.field(self.record_fields[record_id] + 1 + position))
+
+    def lookup(self, selection, limit=None):
+        """Return ids of records whose question contains the selection"""
+        query = normalize_text(selection).encode("utf-8")
+        if not query:
+            return []
+
+        text = self.text
+        key = query[:SUFFIX_KEY_LENGTH]
+        width = len(key)
+        lo = bisect.bisect_left(self.suffixes, key, key=lambda i: text[i:i + width])
+        hi = bisect.bisect_right(self.suffixes, key, lo=lo, key=lambda i: text[i:i + width])
+
+        record_ids = set()
+        for position in self.suffixes[lo:hi]:
+            if width < len(query) and not text.startswith(query, position):
+                continue
+            record_ids.add(self.canonical[bisect.bisect_right(self.starts, position) - 1])
+
+        found = sorted(record_ids)
+        return found[:limit] if limit is not None else found
+
+    def field(self, field_id):
+        offsets = self.field_offsets
+        return self.data[offsets[2 * field_id]:offsets[2 * field_id + 1]].decode("utf-8")
+
+    def record(self, record_id):
+        """Decode one record from the buffer"""
+        first, last = self.record_fields[record_id], self.record_fields[record_id + 1]
+        question, *options = [self.field(field_id) for field_id in range(first, last)]
+        return Record(question, options, self.answers[record_id])
+
+    def record_text(self, record_id):
+        return format_record(self.record(record_id))
+
+    def _lowered(self, needles):
+        """Lowercased copy of the buffer for one scan; not kept on the index.
+
+        bytes.lower() folds ASCII in place. The bank's cased non-ASCII letters,
+        collected once, are replaced one by one, but only when a needle holds
+        the lowercase letter (or folding changes its length): otherwise
+        neither case can be part of a match. UTF-8 sequences never match
+        inside another character, so matches are those of str.lower().
+        """
+        if self._case_folds is None:
+            cased = sorted(c for c in set(self.data.decode("utf-8")) if c > "\x7f" and c.lower() != c)
+            self._case_folds = tuple((c.encode("utf-8"), c.lower().encode("utf-8")) for c in cased)
+        lowered = self.data.lower()
+        for upper, lower in self._case_folds:
+            if len(upper) != len(lower) or any(lower in needle for needle in needles):
+                lowered = lowered.replace(upper, lower)
+        return lowered
+
+    def _line_snippet(self, start, context_lines):
+        end = start
+        for _ in range(context_lines + 1):
+            end = self.data.find(b"\n", end) + 1
+            if not end:
+                end = len(self.data)
+                break
+        snippet = self.data[start:end].decode("utf-8")
+        if snippet.endswith("\n"):
+            snippet = snippet[:-1]
+        return "\n".join(line.strip() for line in snippet.split("\n"))
+
+    def scan_lines(self, keywords, context_lines, limit=None):
+        """Plain line scan for text that is not part of any question.
+
+        Keywords are matched case-insensitively against the buffer, one line at
+        a time; returns one list of (line number, snippet) pairs per keyword.
+        """
+        needles = [keyword.lower().encode("utf-8") for keyword in keywords]
+        lowered = self._lowered(needles)
+        # Lowering changed byte lengths: map lines by number instead of offset
+        lines = None
+        if len(lowered) != len(self.data):
+            lines = self.data.split(b"\n")
+            if self.data.endswith(b"\n"):
+                lines.pop()
+        results = []
+        for needle in needles:
+            matches = []
+            # Lines never contain line breaks, so neither can a match
+            position = 0 if b"\n" not in needle and b"\r" not in needle else -1
+            line = counted = 0
+            while position >= 0 and (limit is None or len(matches) < limit):
+                position = lowered.find(needle, position)
+                if position < 0 or position == len(lowered):
+                    break
+                line += lowered.count(b"\n", counted, position)
+                counted = position
+                line_start = lowered.rfind(b"\n", 0, position) + 1
+                if lines is None:
+                    snippet = self._line_snippet(line_start, context_lines)
+                else:
+                    snippet = "\n".join(
+                        l.decode("utf-8").strip() for l in lines[line:line + context_lines + 1]
+                    )
+                matches.append((line, snippet))
+                position = lowered.find(b"\n", position)
+                if position >= 0:
+                    position += 1
+            results.append(matches)
+        return results
+
+
+def save_indexes(indexes, path):
+    """Write {bank name: BankIndex} to a compiled index file"""
+    parts = [_INDEX_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, len(indexes))]
+    for name, index in indexes.items():
+        encoded_name = name.encode("utf-8")
+        parts.append(_COUNT.pack(len(encoded_name)) + encoded_name)
+        parts.append(_BANK_HEADER.pack(*(index.source_signature or (-1, -1))))
+
+        fingerprints = array("Q", bytes(8 * len(index)))
+        for key, record_ids in index.exact_records.items():
+            for record_id in record_ids:
+                fingerprints[record_id] = key
+        for field, typecode in _INDEX_ARRAYS:
+            values = fingerprints if field == "fingerprints" else getattr(index, field)
+            if isinstance(values, bytes):
+                parts.append(_COUNT.pack(len(values)) + values)
+                continue
+            values = array(typecode, values)
+            if sys.byteorder != "little":
+                values.byteswap()
+            parts.append(_COUNT.pack(len(values)) + values.tobytes())
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(b"".join(parts))
+    os.replace(temp_path, path)
+
+
+def read_indexes(path):
+    """Read a compiled index file back into {bank name: BankIndex}"""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _INDEX_HEADER.size:
+        raise ValueError(f"{path}: not an index file")
+    magic, version, count = _INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC:
+        raise ValueError(f"{path}: not an index file")
+    if version != INDEX_FORMAT_VERSION:
+        raise ValueError(f"{path}: index format {version}, expected {INDEX_FORMAT_VERSION}")
+
+    position = _INDEX_HEADER.size
+
+    def take(size):
+        nonlocal position
+        if position + size > len(data):
+            raise ValueError(f"{path}: truncated index file")
+        chunk = data[position:position + size]
+        position += size
+        return chunk
+
+    indexes = {}
+    for _ in range(count):
+        (name_length,) = _COUNT.unpack(take(_COUNT.size))
+        name = take(name_length).decode("utf-8")
+        signature = _BANK_HEADER.unpack(take(_BANK_HEADER.size))
+        fields = {}
+        for field, typecode in _INDEX_ARRAYS:
+            (length,) = _COUNT.unpack(take(_COUNT.size))
+            if typecode == "B":
+                fields[field] = take(length)
+                continue
+            values = array(typecode)
+            values.frombytes(take(length * values.itemsize))
+            if sys.byteorder != "little":
+                values.byteswap()
+            fields[field] = values
+        records = len(fields["answers"])
+        if not (
+            len(fields["record_fields"]) == records + 1
+            and len(fields["canonical"]) == len(fields["fingerprints"]) == len(fields["starts"]) == records
+            and len(fields["field_offsets"]) == 2 * fields["record_fields"][-1]
+        ):
+            raise ValueError(f"{path}: inconsistent index for {name}")
+
+        index = BankIndex.__new__(BankIndex)
+        index.path = None
+        index.source_signature = None if signature == (-1, -1) else signature
+        index._case_folds = None
+        index.exact_records = {}
+        for record_id, key in enumerate(fields.pop("fingerprints")):
+            index.exact_records[key] = index.exact_records.get(key, ()) + (record_id,)
+        index.__dict__.update(fields)
+        indexes[name] = index
+    return indexes
+
+
+def bundled_index_path():
+    """Location of the index shipped inside the PyInstaller build"""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, BUNDLED_INDEX)
+
+
+def find_bank_file(path):
+    """Return the loose bank file for path, also looking next to a frozen exe"""
+    candidates = [path]
+    if getattr(sys, "frozen", False) and not os.path.isabs(path):
+        candidates.append(os.path.join(os.path.dirname(sys.executable), path))
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return os.path.abspath(candidate)
+    return None
+
+
+_index_cache = {}
+_bundled_indexes = None
+_index_lock = threading.Lock()
+
+
+def _load_bundled():
+    global _bundled_indexes
+    if _bundled_indexes is None:
+        try:
+            _bundled_indexes = read_indexes(bundled_index_path())
+            logger.info(f"Loaded bundled index: {', '.join(_bundled_indexes)}")
+        except FileNotFoundError:
+            _bundled_indexes = {}
+        except Exception as e:
+            logger.warning(f"Ignoring bundled index: {e}")
+            _bundled_indexes = {}
+    return _bundled_indexes
+
+
+def is_available(path):
+    """True if path can be searched, either as a loose file or bundled"""
+    if find_bank_file(path):
+        return True
+    with _index_lock:
+        return os.path.basename(path) in _load_bundled()
+
+
+def _load_with_build_cache(path, signature):
+    """Load a loose bank through its "<bank>.idx" cache, rebuilding when stale"""
+    name = os.path.basename(path)
+    cache_path = path + INDEX_SUFFIX
+    try:
+        index = read_indexes(cache_path)[name]
+        if index.source_signature == signature:
+            index.path = path
+            logger.debug(f"Loaded build cache {cache_path}")
+            return index
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring build cache {cache_path}: {e}")
+
+    with open(path, "r", encoding="utf-8") as file:
+        index = BankIndex(file.read(), path)
+    index.source_signature = signature
+    try:
+        save_indexes({name: index}, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write build cache {cache_path}: {e}")
+    return index
+
+
+def load_index(path):
+    """Return the BankIndex for path.
+
+    A loose bank file wins and goes through the build cache; otherwise the
+    index bundled with the executable is used as is, with no parsing.
+    """
+    bank_file = find_bank_file(path)
+    if bank_file is None:
+        with _index_lock:
+            index = _load_bundled().get(os.path.basename(path))
+        if index is None:
+            raise FileNotFoundError(f"Bank not found: {path}")
+        return index
+
+    stat = os.stat(bank_file)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _index_lock:
+        cached = _index_cache.get(bank_file)
+        if cached and cached.source_signature == signature:
+            return cached
+
+        index = _load_with_build_cache(bank_file, signature)
+        _index_cache[bank_file] = index
+        return index
+
+
+def search_many(keywords, path, max_results=None, context_lines=4, traces=None):
+    """Resolve selections to display snippets, one list per selection.
+
+    Exact full questions are answered from the fingerprint map first. Other
+    selections found in question text return whole records; a selection
+    spanning several lines is retried with its first line. The rest share one
+    fallback line scan.
+
+    If traces is a list, one dict per selection is appended to it: result ids
+    ("r<record>" or "l<line>") and per-stage timings in milliseconds.
+    """
+    clock = time.perf_counter
+    index = load_index(path)
+    unique = list(dict.fromkeys(keywords))
+    resolved = {}
+    stages = {}
+    misses = []
+
+    for keyword in unique:
+        start = clock()
+        record_ids = index.lookup_exact(keyword)[:max_results]
+        exact_done = clock()
+        if not record_ids:
+            record_ids = index.lookup(keyword, max_results)
+        if not record_ids:
+            first_line = keyword.strip().split("\n", 1)[0]
+            if first_line != keyword.strip():
+                record_ids = index.lookup(first_line, max_results)
+        lookup_done = clock()
+        if record_ids:
+            resolved[keyword] = [index.record_text(record_id) for record_id in record_ids]
+        else:
+            misses.append(keyword)
+        stages[keyword] = (
+            [f"r{record_id}" for record_id in record_ids],
+            {"exact": exact_done - start, "lookup": lookup_done - exact_done, "format": clock() - lookup_done},
+        )
+
+    if misses:
+        start = clock()
+        scanned = index.scan_lines(misses, context_lines, max_results)
+        scan_time = clock() - start
+        for keyword, matches in zip(misses, scanned):
+            resolved[keyword] = [snippet for _, snippet in matches]
+            stages[keyword][0].extend(f"l{line}" for line, _ in matches)
+            stages[keyword][1]["scan"] = scan_time
+
+    if traces is not None:
+        for keyword in keywords:
+            ids, timings = stages[keyword]
+            traces.append({
+                "ids": list(ids),
+                "ms": {stage: round(seconds * 1000, 4) for stage, seconds in timings.items()},
+            })
+
+    return [resolved[keyword] for keyword in keywords]
+
+
+def search(keyword, path, max_results=None, context_lines=4, trace=None):
+    """Resolve a single selection to display snippets.
+
+    If trace is a dict it is filled in like one entry of search_many() traces.
+    """
+    traces = [] if trace is not None else None
+    results = search_many([keyword], path, max_results, context_lines, traces)
+    if trace is not None:
+        trace.update(traces[0])
+    return results[0]
@@ -0,0 +1,125 @@
+"""Resolve many questions against a bank in one pass.
+
+    python batch_lookup.py test.txt --bank mb.txt --format csv > answers.csv
+    pbpaste | python batch_lookup.py --bank kte.txt
+
+Input that contains "====" option separators (a copied exam sheet) is read
+record by record, using the last paragraph before the options as the question;
+anything else is read one question per non-empty line. Results are written as
+JSONL (default) or CSV; throughput is reported on stderr.
+"""
+import argparse
+import csv
+import http.client
+import json
+import logging
+import os
+import sys
+import time
+
+import bank_index
+import search_service
+
+
+def read_questions(text):
+    """Extract the questions to look up from pasted or file input"""
+    text = text.lstrip("﻿")
+    if not bank_index.OPTION_SEPARATOR.search(text):
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+    questions = []
+    for chunk in bank_index.RECORD_SEPARATOR.split(text):
+        head = bank_index.OPTION_SEPARATOR.split(chunk, 1)[0]
+        paragraphs = [p.strip() for p in head.replace("\r", "").split("\n\n") if p.strip()]
+        if paragraphs:
+            questions.append(paragraphs[-1])
+    return questions
+
+
+def write_jsonl(out, questions, results):
+    for question, snippets in zip(questions, results):
+        out.write(json.dumps({"query": question, "results": snippets}, ensure_ascii=False) + "\n")
+
+
+def write_csv(out, questions, results):
+    writer = csv.writer(out)
+    writer.writerow(["query", "rank", "result"])
+    for question, snippets in zip(questions, results):
+        if not snippets:
+            writer.writerow([question, 0, ""])
+        for rank, snippet in enumerate(snippets, 1):
+            writer.writerow([question, rank, snippet])
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+# One request carries the whole batch, so allow far more than a single lookup
+SERVER_TIMEOUT = 60.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk question lookup against a question bank")
+    parser.add_argument("input", nargs="?", help="questions file (default: stdin)")
+    parser.add_argument("--bank", default="mb.txt", help="bank file to search (default: mb.txt)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--max-results", type=int, default=4)
+    parser.add_argument("--context-lines", type=int, default=4)
+    parser.add_argument("--server", help="host:port of a running search server")
+    parser.add_argument("--timeout", type=float, default=SERVER_TIMEOUT, help="seconds to wait for the server")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
+    )
+
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as file:
+            questions = read_questions(file.read())
+    else:
+        questions = read_questions(sys.stdin.read())
+
+    if not args.server:
+        # Build the index outside the timed region so throughput is per query
+        try:
+            bank_index.load_index(args.bank)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    start = time.perf_counter()
+    if args.server:
+        # The server knows its banks by file name only
+        client = search_service.SearchClient(args.server, timeout=args.timeout)
+        try:
+            results = client.search_many(
+                questions, os.path.basename(args.bank), args.max_results, args.context_lines
+            )
+        except (OSError, RuntimeError, http.client.HTTPException, ValueError) as e:
+            print(f"Error: search server {args.server}: {e}", file=sys.stderr)
+            return 1
+        finally:
+            client.close()
+    else:
+        results = bank_index.search_many(questions, args.bank, args.max_results, args.context_lines)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            WRITERS[args.format](out, questions, results)
+    else:
+        WRITERS[args.format](sys.stdout, questions, results)
+
+    found = sum(1 for snippets in results if snippets)
+    rate = len(questions) / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"Resolved {found}/{len(questions)} queries in {elapsed * 1000:.1f} ms "
+        f"({rate:,.0f} queries/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
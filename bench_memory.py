@@ -0,0 +1,75 @@
+"""Compare memory held by a loaded bank under different storage layouts.
+
+    python bench_memory.py mb.txt kte.txt --repeat 50
+
+Measured with tracemalloc as the memory still allocated after loading:
+the raw file as a list of lines, as per-record str objects, and as a
+BankIndex (one UTF-8 buffer plus offset arrays, and the search structures).
+The BankIndex is measured after one fallback line scan, so anything a scan
+keeps on the index is counted too. --repeat concatenates the banks N times to
+approximate a large corpus.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+import bank_index
+
+
+def retained(build):
+    """Bytes still allocated by build() while its result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory footprint of bank storage layouts")
+    parser.add_argument("banks", nargs="*", default=["mb.txt", "kte.txt"])
+    parser.add_argument("--repeat", type=int, default=1, help="concatenate the banks N times")
+    args = parser.parse_args(argv)
+
+    chunks = []
+    for path in args.banks:
+        with open(path, "r", encoding="utf-8") as file:
+            chunks.append(file.read().lstrip("﻿").rstrip() + "\n+++++\n")
+    raw_text = "".join(chunks) * args.repeat
+    raw_bytes = len(raw_text.encode("utf-8"))
+
+    lines_size, _ = retained(lambda: raw_text.splitlines())
+    records_size, _ = retained(lambda: bank_index.parse_bank(raw_text))
+
+    def build_and_scan():
+        index = bank_index.BankIndex(raw_text)
+        index.scan_lines(["no such text"], context_lines=4)
+        return index
+
+    index_size, index = retained(build_and_scan)
+
+    storage_size = sum(
+        sys.getsizeof(part)
+        for part in (index.data, index.field_offsets, index.record_fields, index.answers)
+    )
+    search_size = sum(sys.getsizeof(part) for part in (index.text, index.starts, index.suffixes))
+
+    print(f"{len(index)} records, {raw_bytes:,} bytes of UTF-8 text")
+    rows = [
+        ("list of lines", lines_size),
+        ("per-record str objects", records_size),
+        ("BankIndex total", index_size),
+        ("  buffer + offset arrays", storage_size),
+        ("  search text + suffix array", search_size),
+    ]
+    for label, size in rows:
+        print(f"{label:<30} {size:>12,} bytes  {size / raw_bytes:5.2f}x text")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Measure time-to-ready of the application builds.
+
+Each command is launched repeatedly; time-to-ready is the wall time until the
+ready line shows up in its log output, after which the process is killed. The
+default marker, "Search ready", is logged once the background warm-up has
+imported the search modules and loaded the bank index.
+
+    ./create_exe.sh --baseline && ./create_exe.sh && ./create_exe.sh --onedir
+    python bench_startup.py                       # all three builds
+    python bench_startup.py "python main.py" --cwd .
+
+By default every run starts in a fresh, empty temporary directory, so the
+spec builds search their bundled index. The baseline build (the original
+``pyinstaller --onefile main.py``, no excludes, no bundled index) cannot find
+a bank otherwise, so it gets a copy of --bank, as it did when shipped.
+"""
+import argparse
+import os
+import re
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+DEFAULT_READY = r"Search ready"
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+# (executable, needs a loose bank file)
+DEFAULT_BUILDS = [
+    (os.path.join("dist", "main_baseline" + EXE_SUFFIX), True),
+    (os.path.join("dist", "main" + EXE_SUFFIX), False),
+    (os.path.join("dist", "main_onedir", "main" + EXE_SUFFIX), False),
+]
+
+
+def time_to_ready(command, ready, timeout, cwd=None):
+    """Launch command once and return seconds until a line matches ready"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        for line in process.stdout:
+            if ready.search(line):
+                return time.perf_counter() - start
+        return None
+    finally:
+        timer.cancel()
+        process.kill()
+        process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark application time-to-ready")
+    parser.add_argument("commands", nargs="*", help="commands to launch (default: both PyInstaller builds)")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--ready", default=DEFAULT_READY, help="regex marking the app as ready")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a run is abandoned")
+    parser.add_argument("--cwd", help="run in this directory instead of a fresh empty one")
+    parser.add_argument("--bank", default="mb.txt", help="bank copied in for the baseline build")
+    args = parser.parse_args(argv)
+
+    if args.commands:
+        builds = [(command, False) for command in args.commands]
+    else:
+        builds = [(os.path.abspath(path), needs_bank) for path, needs_bank in DEFAULT_BUILDS if os.path.exists(path)]
+    if not builds:
+        print(
+            "No builds found; run ./create_exe.sh --baseline, ./create_exe.sh and "
+            "./create_exe.sh --onedir first",
+            file=sys.stderr,
+        )
+        return 1
+
+    ready = re.compile(args.ready)
+    print(f"{'command':<40} {'min':>9} {'median':>9} {'max':>9}  runs")
+    for command, needs_bank in builds:
+        argv_ = [command] if os.path.exists(command) else shlex.split(command)
+        timings = []
+        for _ in range(args.runs):
+            if args.cwd:
+                elapsed = time_to_ready(argv_, ready, args.timeout, args.cwd)
+            else:
+                with tempfile.TemporaryDirectory() as run_dir:
+                    if needs_bank:
+                        shutil.copy(args.bank, run_dir)
+                    elapsed = time_to_ready(argv_, ready, args.timeout, run_dir)
+            if elapsed is not None:
+                timings.append(elapsed * 1000)
+        if not timings:
+            print(f"{command:<40} never became ready")
+            continue
+        print(
+            f"{command:<40} {min(timings):8.1f}ms {statistics.median(timings):8.1f}ms "
+            f"{max(timings):8.1f}ms  {len(timings)}/{args.runs}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Compile question banks into the pre-built index bundled with the executable.
+
+    python build_bank.py mb.txt kte.txt --output build/bank.idx
+
+main.spec embeds the output through ``datas``; at runtime bank_index loads it
+without parsing any text, unless a loose bank file of the same name is present.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import bank_index
+
+
+DEFAULT_OUTPUT = os.path.join("build", bank_index.BUNDLED_INDEX)
+
+
+def build(bank_paths, output):
+    indexes = {}
+    for path in bank_paths:
+        with open(path, "r", encoding="utf-8") as file:
+            indexes[os.path.basename(path)] = bank_index.BankIndex(file.read())
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    bank_index.save_indexes(indexes, output)
+    return indexes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile question banks into a pre-built index")
+    parser.add_argument("banks", nargs="*", default=["mb.txt"], help="bank files to compile")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
+    )
+
+    start = time.perf_counter()
+    indexes = build(args.banks, args.output)
+    elapsed = time.perf_counter() - start
+    logging.info(
+        f"Wrote {args.output} ({os.path.getsize(args.output):,} bytes, "
+        f"{sum(len(index) for index in indexes.values())} records) in {elapsed * 1000:.0f} ms"
+    )
+
+    start = time.perf_counter()
+    bank_index.read_indexes(args.output)
+    logging.info(f"Index loads in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
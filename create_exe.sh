@@ -1,5 +1,11 @@
 #!/bin/bash
 
+# Usage: ./create_exe.sh [--onedir | --baseline]
+#   default     single-file dist/main (slower start: unpacks to a temp dir each launch)
+#   --onedir    dist/main_onedir/main (faster start, ship the whole folder)
+#   --baseline  dist/main_baseline, the original "pyinstaller --onefile main.py"
+#               build (no spec, no excludes, no bundled index) for bench_startup.py
+
 # Install required libraries
 if [ -f "requirements.txt" ]; then
   echo "Installing dependencies from requirements.txt..."
@@ -8,8 +14,23 @@ else
   echo "Warning: requirements.txt file not found. Dependencies may be missing."
 fi
 
-# Convert main.py to an executable
-pyinstaller --onefile main.py
+if [ "$1" == "--baseline" ]; then
+  pyinstaller --noconfirm --onefile --name main_baseline \
+    --workpath build/baseline --specpath build/baseline main.py
+  status=$?
+  [ $status -eq 0 ] && echo "Baseline executable created successfully." || echo "Failed to create baseline executable."
+  exit $status
+fi
+
+# Compile the question banks into the index bundled with the executable
+python build_bank.py mb.txt kte.txt --output build/bank.idx || exit 1
+
+# Convert main.py to an executable using the checked-in spec (excludes, variants)
+if [ "$1" == "--onedir" ]; then
+  BOT_HELP_ONEDIR=1 pyinstaller --noconfirm main.spec
+else
+  pyinstaller --noconfirm main.spec
+fi
 
 # Notify the user
 if [ $? -eq 0 ]; then
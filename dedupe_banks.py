@@ -0,0 +1,200 @@
+"""Find duplicate and near-duplicate records across bank files.
+
+    python dedupe_banks.py mb.txt kte.txt --output merged.txt
+
+Records are compared on their normalized question and options using MinHash
+signatures with LSH banding; candidate pairs are confirmed with the exact
+Jaccard similarity of their shingle sets and grouped into clusters.
+
+The report lists every cluster, flagging questions that appear with different
+correct answers. The output bank keeps one record per (question, answer) pair;
+near-duplicates with different wording are only reported, unless
+--merge-near is given, which also drops a record whose answer and option set
+match a kept record and whose question is near-identical to it.
+"""
+import argparse
+import random
+import sys
+import zlib
+from collections import defaultdict
+
+import bank_index
+
+
+SHINGLE_SIZE = 5
+NUM_HASHES = 64
+BANDS = 16
+THRESHOLD = 0.8
+# --merge-near only drops a record whose question alone is at least this
+# similar to a kept one with the same answer and option set
+MERGE_QUESTION_THRESHOLD = 0.9
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Character shingles of normalized text, hashed to 32 bits"""
+    text = bank_index.normalize_text(text)
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_hashes=NUM_HASHES, seed=1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_hashes)]
+
+    def signature(self, shingle_set):
+        return tuple(
+            min(((a * value + b) % _PRIME) & _MAX_HASH for value in shingle_set)
+            for a, b in self.params
+        )
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def find_clusters(shingle_sets, keys=None, bands=BANDS, threshold=THRESHOLD, num_hashes=NUM_HASHES):
+    """Group item ids whose shingle sets are at least threshold-similar.
+
+    Items with equal keys, if given, are always grouped together.
+    """
+    hasher = MinHasher(num_hashes)
+    rows = num_hashes // bands
+    buckets = defaultdict(list)
+    for item_id, shingle_set in enumerate(shingle_sets):
+        signature = hasher.signature(shingle_set)
+        for band in range(bands):
+            buckets[(band, signature[band * rows:(band + 1) * rows])].append(item_id)
+
+    parent = list(range(len(shingle_sets)))
+
+    def root(item_id):
+        while parent[item_id] != item_id:
+            parent[item_id] = parent[parent[item_id]]
+            item_id = parent[item_id]
+        return item_id
+
+    if keys is not None:
+        first_with_key = {}
+        for item_id, key in enumerate(keys):
+            parent[root(item_id)] = root(first_with_key.setdefault(key, item_id))
+
+    checked = set()
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                if (first, second) in checked:
+                    continue
+                checked.add((first, second))
+                if jaccard(shingle_sets[first], shingle_sets[second]) >= threshold:
+                    parent[root(second)] = root(first)
+
+    clusters = defaultdict(list)
+    for item_id in range(len(shingle_sets)):
+        clusters[root(item_id)].append(item_id)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def record_key(record):
+    """Identity used for exact duplicates: normalized question and answer"""
+    answer = record.options[record.answer] if record.answer >= 0 else ""
+    return bank_index.fingerprint(record.question), bank_index.normalize_text(answer)
+
+
+def options_key(record):
+    """Normalized option texts, without the answer marker, in any order"""
+    return frozenset(
+        bank_index.normalize_text(bank_index.answer_text(option) if i == record.answer else option)
+        for i, option in enumerate(record.options)
+    )
+
+
+def format_bank(records):
+    """Render records in the bank file layout"""
+    blocks = []
+    for record in records:
+        blocks.append("\n====\n".join([record.question] + record.options))
+    return "\n\n+++++\n\n".join(blocks) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cluster duplicate records across question banks")
+    parser.add_argument("banks", nargs="*", default=["mb.txt", "kte.txt"])
+    parser.add_argument("--output", help="write the deduplicated bank here")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Jaccard similarity for near-duplicates")
+    parser.add_argument(
+        "--merge-near", action="store_true",
+        help="also drop near-duplicates with the same answer, the same options and a near-identical question",
+    )
+    args = parser.parse_args(argv)
+
+    records, sources = [], []
+    for path in args.banks:
+        with open(path, "r", encoding="utf-8") as file:
+            for record in bank_index.parse_bank(file.read()):
+                records.append(record)
+                sources.append(path)
+
+    shingle_sets = [shingles(" ".join([r.question] + sorted(r.options))) for r in records]
+    question_keys = [bank_index.fingerprint(record.question) for record in records]
+    clusters = find_clusters(shingle_sets, question_keys, threshold=args.threshold)
+
+    dropped = set()
+    conflicts = 0
+    for members in sorted(clusters, key=len, reverse=True):
+        answers_by_question = defaultdict(set)
+        for record_id in members:
+            question_key, answer_key = record_key(records[record_id])
+            answers_by_question[question_key].add(answer_key)
+        if any(len(answers) > 1 for answers in answers_by_question.values()):
+            conflicts += 1
+            label = "CONFLICT"
+        else:
+            label = "duplicate" if len(answers_by_question) == 1 else "near-duplicate"
+
+        print(f"[{label}] {len(members)} records", file=sys.stderr)
+        for record_id in members:
+            record = records[record_id]
+            answer = record.options[record.answer] if record.answer >= 0 else "(no answer)"
+            print(f"    {sources[record_id]}: {record.question[:70]!r} -> {answer[:40]!r}", file=sys.stderr)
+
+        kept = set()
+        kept_questions = defaultdict(list)
+        for record_id in members:
+            record = records[record_id]
+            question_key, answer_key = record_key(record)
+            if (question_key, answer_key) in kept:
+                dropped.add(record_id)
+                continue
+            if args.merge_near:
+                # Near-duplicate wording only merges with the same answer and
+                # options; MIN()/MAX()-style pairs differ in those or in the question
+                near_key = (answer_key, options_key(record))
+                question = shingles(record.question)
+                if any(
+                    jaccard(question, other) >= MERGE_QUESTION_THRESHOLD
+                    for other in kept_questions[near_key]
+                ):
+                    dropped.add(record_id)
+                    continue
+                kept_questions[near_key].append(question)
+            kept.add((question_key, answer_key))
+
+    print(
+        f"{len(records)} records, {len(clusters)} clusters, {conflicts} with conflicting answers, "
+        f"{len(dropped)} records dropped",
+        file=sys.stderr,
+    )
+    if args.output:
+        kept_records = [record for i, record in enumerate(records) if i not in dropped]
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(format_bank(kept_records))
+        print(f"Wrote {len(kept_records)} records to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
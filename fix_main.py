@@ -4,7 +4,10 @@ from pynput.mouse import Controller
 import subprocess
 import time
 
+from selection_filter import SelectionFilter
+
 TEXT_FILE_PATH = "kte.txt"  # ⬅️ Set your file path here
+selection_filter = SelectionFilter(button=mouse.Button.left)
 
 
 def get_clipboard_text():
@@ -17,16 +20,9 @@ def get_clipboard_text():
 def search_in_file(keyword, context=8):  # Shows 8 lines after the match
     matches = []
     try:
-        with open(TEXT_FILE_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        for i, line in enumerate(lines):
-            if keyword.lower() in line.lower():
-                # Start from the matching line
-                start = i
-                # Show the next 'context' number of lines
-                end = min(len(lines), i + context + 1)
-                snippet = "".join(lines[start:end]).strip()
-                matches.append(snippet)
+        import search_service
+
+        matches = search_service.search(keyword, TEXT_FILE_PATH, context_lines=context)
     except Exception as e:
         matches.append(f"Error reading file: {e}")
     if not matches:
@@ -127,7 +123,9 @@ keyboard.Listener(on_press=on_key_press).start()
 
 
 def on_mouse_release(x, y, button, pressed):
-    if not pressed:
+    if pressed:
+        selection_filter.on_press(x, y, button)
+    elif selection_filter.on_release(x, y, button):
         subprocess.run("pbcopy < /dev/null", shell=True)
         subprocess.run(
             'osascript -e \'tell application "System Events" to keystroke "c" using command down\'',
@@ -142,6 +140,8 @@ def on_mouse_release(x, y, button, pressed):
             root.after(0, lambda: show_popup(snippets))
             mouse_controller = Controller()
             mouse_controller.position = (x, y)
+            # The synthetic re-click must not extend a double-click run
+            selection_filter.ignore_next_click()
             mouse_controller.click(button)
 
 
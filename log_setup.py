@@ -0,0 +1,105 @@
+"""Non-blocking logging for the front ends.
+
+Log calls only enqueue the record; a QueueListener thread formats it and does
+the I/O, so the input-hook threads never wait on the console or the disk.
+Output goes to the console and, as JSON lines, to a rotating debug.log.
+
+Per-event messages (every mouse release, search and popup) go to the
+EVENT_LOGGER logger, whose level is set separately with BOT_HELP_EVENT_LOG
+(off, info or debug). Log them with %-style arguments: when the level is
+disabled the call returns before any formatting happens.
+
+Environment:
+    BOT_HELP_LOG_LEVEL  console/file level (default INFO)
+    BOT_HELP_EVENT_LOG  per-event level: off (default), info, debug
+    BOT_HELP_LOG_FILE   JSON-lines log file (default debug.log, "" disables)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+
+EVENT_LOGGER = "bot_help.events"
+LOG_FILE = "debug.log"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_EVENT_LEVELS = {"off": logging.CRITICAL + 1, "info": logging.INFO, "debug": logging.DEBUG}
+_listener = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() renders the message in the calling thread. The queue
+    # never leaves this process, so hand the record over as is and let the
+    # listener thread do all the formatting.
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(level=None, event_level=None, log_file=None):
+    """Route all logging through a background listener thread"""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = level or os.environ.get("BOT_HELP_LOG_LEVEL", "INFO").upper()
+    event_level = event_level or os.environ.get("BOT_HELP_EVENT_LOG", "off").lower()
+    if log_file is None:
+        log_file = os.environ.get("BOT_HELP_LOG_FILE", LOG_FILE)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt='%H:%M:%S'))
+    handlers = [console]
+    file_error = None
+    if log_file:
+        try:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+            )
+        except OSError as e:
+            # A read-only working directory (e.g. an app launched from /) must
+            # not keep the UI from starting; log to the console only
+            file_error = e
+        else:
+            file_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+    logging.getLogger(EVENT_LOGGER).setLevel(_EVENT_LEVELS.get(event_level, logging.INFO))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(stop_logging)
+    if file_error is not None:
+        logging.getLogger(__name__).warning(f"Logging to console only, cannot open {log_file}: {file_error}")
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
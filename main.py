@@ -1,19 +1,27 @@
+import sys
+
+# "python main.py serve" runs the headless search server; dispatch before the
+# GUI and input-hook imports so it works without a display.
+if __name__ == "__main__" and sys.argv[1:2] == ["serve"]:
+    import search_service
+
+    sys.exit(search_service.main(sys.argv[2:]))
+
 import tkinter as tk
 import pyperclip
 from pynput import mouse, keyboard
 import time
-import sys
-import os
 import subprocess
 import logging
+import threading
+
+import log_setup
+from selection_filter import SelectionFilter
 
 
-# Configure logging with more detail
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%H:%M:%S'
-)
+# Queue-based logging: console plus JSON lines in debug.log, see log_setup.py
+log_setup.configure_logging()
+event_log = logging.getLogger(log_setup.EVENT_LOGGER)
 
 # Global variables
 TEXT_FILE_PATH = "mb.txt"
@@ -23,6 +31,7 @@ current_index = 0
 root = None
 is_running = True
 MAX_RESULTS = 4  # Limit maximum number of results
+selection_filter = SelectionFilter(button=mouse.Button.left)
 
 logging.info("=" * 50)
 logging.info("Starting main.py application")
@@ -99,55 +108,56 @@ def check_accessibility_permissions():
         return False
 
 
-def search_in_file(keyword, context_lines=4):  # Reduced context lines tcp
-    logging.info(f"Searching for keyword: '{keyword}'")
+def search_in_file(keyword, context_lines=4, source="clipboard", timings=None):  # Reduced context lines tcp
+    event_log.debug("Searching for keyword: %r", keyword)
     results = []
 
     try:
-        if not os.path.exists(TEXT_FILE_PATH):
-            logging.error(f"File not found: {TEXT_FILE_PATH}")
-            print(f"Error: File {TEXT_FILE_PATH} not found")
-            global is_running, root
-            is_running = False
-            if root and root.winfo_exists():
-                root.quit()
-                root.destroy()
-            return [f"Error: File {TEXT_FILE_PATH} not found"]
-
-        with open(TEXT_FILE_PATH, "r", encoding="utf-8") as file:
-            line_num = 0
-
-            for line in file:
-                if keyword.lower() in line.lower():
-                    snippet = line.strip()
-                    # Add additional lines after the match
-                    for _ in range(context_lines):
-                        next_line = next(file, None)
-                        if next_line:
-                            snippet += f"\n{next_line.strip()}"
-                    results.append(snippet)
-                    if len(results) >= MAX_RESULTS:  # Limit number of results
-                        break
-                line_num += 1
-
-                if line_num % 1000 == 0:  # Periodic garbage collection
-                    import gc
-
-                    gc.collect()
-
+        import query_log
+        import search_service
+
+        log = query_log.get_query_log()
+        trace = {} if log else None
+        start = time.perf_counter()
+        results = search_service.search(keyword, TEXT_FILE_PATH, MAX_RESULTS, context_lines, trace)
+        if log:
+            timings = dict(timings or {}, search=time.perf_counter() - start)
+            log.record(keyword, source, TEXT_FILE_PATH, MAX_RESULTS, context_lines, trace, timings)
+
+    except FileNotFoundError:
+        # Only reached when searching locally: a configured server holds its own banks
+        logging.error(f"File not found: {TEXT_FILE_PATH}")
+        print(f"Error: File {TEXT_FILE_PATH} not found")
+        global is_running, root
+        is_running = False
+        if root and root.winfo_exists():
+            root.quit()
+            root.destroy()
+        return [f"Error: File {TEXT_FILE_PATH} not found"]
     except Exception as e:
         logging.error(f"Error reading file: {str(e)}")
         results.append(f"[Error reading file: {e}]")
 
     if results:
-        logging.info(f"Found {len(results)} match(es) for '{keyword}'")
+        event_log.info("Found %d match(es)", len(results))
     else:
-        logging.info(f"No match found for '{keyword}'")
+        event_log.info("No match found")
     return results if results else [f"No match found for: '{keyword}'"]
 
 
+def warm_up_search():
+    """Import the search stack and build the bank index off the UI thread"""
+    try:
+        import search_service
+
+        search_service.warm_up(TEXT_FILE_PATH)
+        logging.info("Search ready")
+    except Exception as e:
+        logging.error(f"Error preparing search: {str(e)}")
+
+
 def create_popup(text_list):
-    logging.info(f"Creating popup with {len(text_list)} result(s)")
+    event_log.debug("Creating popup with %d result(s)", len(text_list))
     global popup_window, current_index, root
 
     if not root:
@@ -162,7 +172,7 @@ def create_popup(text_list):
 
     try:
         if popup_window and popup_window.winfo_exists():
-            logging.debug("Destroying existing popup window")
+            event_log.debug("Destroying existing popup window")
             popup_window.destroy()
             del popup_window  # Explicitly delete old window
 
@@ -246,9 +256,15 @@ def show_popup(text_list):
 
 
 def on_mouse_release(x, y, button, pressed):
-    if not pressed and is_running:
-        logging.debug(f"Mouse released at ({x}, {y})")
+    if pressed:
+        selection_filter.on_press(x, y, button)
+        return
+    if not selection_filter.on_release(x, y, button):
+        return
+    if is_running:
+        event_log.debug("Selection released at (%d, %d)", x, y)
         try:
+            copy_start = time.perf_counter()
             kb = keyboard.Controller()
             with kb.pressed(keyboard.Key.ctrl):
                 kb.press("c")
@@ -256,19 +272,20 @@ def on_mouse_release(x, y, button, pressed):
 
             time.sleep(0.1)
             selected = pyperclip.paste().strip()
+            copy_time = time.perf_counter() - copy_start
 
             if not selected:
-                logging.debug("No text selected")
+                event_log.debug("No text selected")
                 return
 
-            logging.info(f"Text selected: '{selected[:50]}...'" if len(selected) > 50 else f"Text selected: '{selected}'")
+            event_log.debug("Text selected (%d chars): %.50s", len(selected), selected)
             global last_text
             if selected and selected != last_text:
                 last_text = selected
-                matches = search_in_file(selected)
+                matches = search_in_file(selected, timings={"copy": copy_time})
                 show_popup(matches)
             else:
-                logging.debug("Same text as before, skipping")
+                event_log.debug("Same text as before, skipping")
         except Exception as e:
             logging.error(f"Error in mouse release handler: {str(e)}")
 
@@ -307,6 +324,7 @@ if __name__ == "__main__":
 
         logging.info("Application is now running. Select text with mouse to search.")
         logging.info("Press Ctrl+C in terminal to quit.")
+        threading.Thread(target=warm_up_search, daemon=True).start()
         root.after(1000, check_running)
         root.mainloop()
 
@@ -314,4 +332,5 @@ if __name__ == "__main__":
         logging.error(f"Fatal error in main: {str(e)}")
         sys.exit(1)
     finally:
+        logging.info(f"Input filter: {selection_filter.summary()}")
         logging.info("Application terminated")
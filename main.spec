@@ -1,38 +1,98 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+# BOT_HELP_ONEDIR=1 pyinstaller main.spec builds dist/main_onedir/ instead of
+# the single-file dist/main: nothing is unpacked to a temp directory at launch
+# and the binaries are left uncompressed, so time-to-ready is much lower.
+ONEDIR = os.environ.get("BOT_HELP_ONEDIR") == "1"
+
+# Modules the analysis pulls in that main.py never reaches at runtime.
+EXCLUDES = [
+    'PIL',
+    'pytesseract',
+    'numpy',
+    'unittest',
+    'doctest',
+    'pydoc',
+    'lib2to3',
+    'tkinter.test',
+    'xmlrpc',
+    'sqlite3',
+    'tarfile',
+    'bz2',
+    '_bz2',
+    'lzma',
+    '_lzma',
+]
+
+# Pre-built bank index from build_bank.py (create_exe.sh runs it first). The
+# executable loads it without parsing; a loose mb.txt next to it still wins.
+BANK_INDEX = os.path.join('build', 'bank.idx')
+DATAS = [(BANK_INDEX, '.')] if os.path.exists(BANK_INDEX) else []
+if not DATAS:
+    print(f"WARNING: {BANK_INDEX} not found, building without a bundled bank index")
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=[],
+    datas=DATAS,
+    hiddenimports=['search_service'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=True,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if ONEDIR:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='main_onedir',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
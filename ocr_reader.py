@@ -1,13 +1,15 @@
 import tkinter as tk
-from tkinter import ttk
-import pytesseract
-from PIL import ImageGrab, Image
 import pyperclip
-from pynput import mouse, keyboard
+from pynput import keyboard
 import time
 import sys
-import os
 import logging
+import threading
+
+import log_setup
+
+# pytesseract and PIL are imported on first use: they are only needed once
+# monitoring starts, and loading them dominates start-up time.
 
 
 # Global variables
@@ -21,12 +23,9 @@ MAX_RESULTS = 4
 selection_overlay = None
 
 
-# Configure logging with more detail
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%H:%M:%S'
-)
+# Queue-based logging: console plus JSON lines in debug.log, see log_setup.py
+log_setup.configure_logging()
+event_log = logging.getLogger(log_setup.EVENT_LOGGER)
 
 logging.info("=" * 50)
 logging.info("Starting OCR Reader application")
@@ -43,7 +42,7 @@ sys.excepthook = handle_exception
 
 def capture_screen_region(x1, y1, x2, y2):
     """Capture a region of the screen and return PIL Image"""
-    logging.info(f"Capturing screen region: ({x1}, {y1}) to ({x2}, {y2})")
+    event_log.info("Capturing screen region: (%d, %d) to (%d, %d)", x1, y1, x2, y2)
     try:
         # Ensure coordinates are in correct order
         left = min(x1, x2)
@@ -51,10 +50,12 @@ def capture_screen_region(x1, y1, x2, y2):
         right = max(x1, x2)
         bottom = max(y1, y2)
         
-        logging.debug(f"Adjusted coordinates: ({left}, {top}) to ({right}, {bottom})")
+        event_log.debug("Adjusted coordinates: (%d, %d) to (%d, %d)", left, top, right, bottom)
+        from PIL import ImageGrab
+
         # Capture the screen region
         screenshot = ImageGrab.grab(bbox=(left, top, right, bottom))
-        logging.info(f"Screen captured successfully. Size: {screenshot.size}")
+        event_log.info("Screen captured successfully. Size: %s", screenshot.size)
         return screenshot
     except Exception as e:
         logging.error(f"Error capturing screen: {str(e)}")
@@ -63,42 +64,40 @@ def capture_screen_region(x1, y1, x2, y2):
 
 def extract_text_from_image(image):
     """Extract text from image using Pytesseract OCR"""
-    logging.info("Starting OCR text extraction...")
+    event_log.debug("Starting OCR text extraction...")
     try:
+        import pytesseract
+
         # Use pytesseract to extract text
         text = pytesseract.image_to_string(image, lang='eng')
         text = text.strip()
-        logging.info(f"OCR completed. Extracted {len(text)} characters")
-        logging.debug(f"Extracted text: {text[:100]}..." if len(text) > 100 else f"Extracted text: {text}")
+        event_log.info("OCR completed. Extracted %d characters", len(text))
+        event_log.debug("Extracted text: %.100s", text)
         return text
     except Exception as e:
         logging.error(f"Error extracting text: {str(e)}")
         return f"Error: {str(e)}"
 
 
-def search_in_file(keyword, context_lines=4):
+def search_in_file(keyword, context_lines=4, source="ocr", timings=None):
     """Search for keyword in text file and return matching results"""
     results = []
 
     try:
-        if not os.path.exists(TEXT_FILE_PATH):
-            logging.error(f"File not found: {TEXT_FILE_PATH}")
-            return [f"Error: File {TEXT_FILE_PATH} not found"]
-
-        with open(TEXT_FILE_PATH, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-            
-        for i, line in enumerate(lines):
-            if keyword.lower() in line.lower():
-                snippet = line.strip()
-                # Add context lines after the match
-                for j in range(1, context_lines + 1):
-                    if i + j < len(lines):
-                        snippet += f"\n{lines[i + j].strip()}"
-                results.append(snippet)
-                if len(results) >= MAX_RESULTS:
-                    break
-
+        import query_log
+        import search_service
+
+        log = query_log.get_query_log()
+        trace = {} if log else None
+        start = time.perf_counter()
+        results = search_service.search(keyword, TEXT_FILE_PATH, MAX_RESULTS, context_lines, trace)
+        if log:
+            timings = dict(timings or {}, search=time.perf_counter() - start)
+            log.record(keyword, source, TEXT_FILE_PATH, MAX_RESULTS, context_lines, trace, timings)
+
+    except FileNotFoundError:
+        logging.error(f"File not found: {TEXT_FILE_PATH}")
+        return [f"Error: File {TEXT_FILE_PATH} not found"]
     except Exception as e:
         logging.error(f"Error reading file: {str(e)}")
         results.append(f"[Error reading file: {e}]")
@@ -106,6 +105,36 @@ def search_in_file(keyword, context_lines=4):
     return results if results else [f"No match found for: '{keyword}'"]
 
 
+def check_tesseract():
+    """Import pytesseract and confirm the Tesseract binary is installed"""
+    logging.info("Checking Tesseract installation...")
+    try:
+        import pytesseract
+
+        version = pytesseract.get_tesseract_version()
+        logging.info(f"Tesseract version: {version}")
+        return True
+    except Exception as e:
+        logging.error(f"Tesseract not found: {str(e)}")
+        print("Error: Pytesseract not found!")
+        print("Please install Tesseract OCR:")
+        print("  macOS: brew install tesseract")
+        print("  Linux: sudo apt-get install tesseract-ocr")
+        print("  Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki")
+        return False
+
+
+def warm_up_search():
+    """Import the search stack and build the bank index off the UI thread"""
+    try:
+        import search_service
+
+        search_service.warm_up(TEXT_FILE_PATH)
+        logging.info("Search ready")
+    except Exception as e:
+        logging.error(f"Error preparing search: {str(e)}")
+
+
 def create_popup(text_list, title="OCR Results"):
     """Create popup window to display results"""
     global popup_window, current_index, root
@@ -281,11 +310,15 @@ def process_selection(start_pos, end_pos):
     time.sleep(0.2)
 
     # Capture screen region
+    capture_start = time.perf_counter()
     image = capture_screen_region(start_pos[0], start_pos[1], end_pos[0], end_pos[1])
+    capture_time = time.perf_counter() - capture_start
     
     if image:
         # Extract text using OCR
+        ocr_start = time.perf_counter()
         extracted_text = extract_text_from_image(image)
+        ocr_time = time.perf_counter() - ocr_start
         
         if extracted_text and extracted_text != last_extracted_text:
             last_extracted_text = extracted_text
@@ -298,14 +331,17 @@ def process_selection(start_pos, end_pos):
                 # Search for the first few words
                 search_terms = extracted_text.split()[:3]  # First 3 words
                 if search_terms:
-                    matches = search_in_file(' '.join(search_terms))
+                    matches = search_in_file(
+                        ' '.join(search_terms),
+                        timings={"capture": capture_time, "ocr": ocr_time},
+                    )
                     if matches and "No match found" not in matches[0]:
                         root.after(100, lambda: create_popup(matches, "Search Results"))
 
 
 def on_hotkey():
     """Triggered when hotkey is pressed - shows selection overlay"""
-    logging.info("Hotkey pressed! Showing selection overlay...")
+    event_log.info("Hotkey pressed! Showing selection overlay...")
     if is_running and root and root.winfo_exists():
         root.after(0, show_selection_overlay)
     else:
@@ -373,6 +409,9 @@ def create_control_window():
     
     def start_monitoring():
         global is_running
+        if not check_tesseract():
+            status_label.config(text="Status: Tesseract not found", fg="red")
+            return
         is_running = True
         setup_hotkey_listener()
         start_btn.config(state=tk.DISABLED, text="✓ Monitoring Active")
@@ -409,20 +448,6 @@ def create_control_window():
 
 if __name__ == "__main__":
     try:
-        # Check if pytesseract is available
-        logging.info("Checking Tesseract installation...")
-        try:
-            version = pytesseract.get_tesseract_version()
-            logging.info(f"Tesseract version: {version}")
-        except Exception as e:
-            logging.error(f"Tesseract not found: {str(e)}")
-            print("Error: Pytesseract not found!")
-            print("Please install Tesseract OCR:")
-            print("  macOS: brew install tesseract")
-            print("  Linux: sudo apt-get install tesseract-ocr")
-            print("  Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki")
-            sys.exit(1)
-
         logging.info("Creating main window...")
         root = tk.Tk()
         root.withdraw()  # Hide main window
@@ -442,6 +467,7 @@ if __name__ == "__main__":
         control_window.protocol("WM_DELETE_WINDOW", on_close)
         
         logging.info("Application ready. Waiting for user input...")
+        threading.Thread(target=warm_up_search, daemon=True).start()
         root.mainloop()
 
     except Exception as e:
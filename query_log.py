@@ -0,0 +1,115 @@
+"""Optional record of every lookup, replayed by replay_queries.py.
+
+Set BOT_HELP_QUERY_LOG to a file path to enable it. Each lookup appends one
+JSON line with short keys:
+
+    {"t": 1760832000.1, "src": "clipboard", "bank": "mb.txt", "k": 4, "c": 4,
+     "q": "normalized query", "raw": "selection as captured", "ids": ["r3", "l120"],
+     "ms": {"copy": 101.2, "exact": 0.01, "lookup": 0.05, "format": 0.02, "search": 0.4}}
+
+"raw" is the selection exactly as the front end passed it to the engine, so a
+replay goes through the same stages; "q" is there for reading and grouping.
+"ids" and the engine stages (exact, lookup, format, scan) come from
+bank_index.search_many() traces; the front end adds its own stages such as
+"copy", "capture", "ocr" and the end-to-end "search" time.
+
+record() only enqueues the raw fields; a writer thread normalizes, serializes
+and writes them, so the input-hook threads never wait on the disk.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+import bank_index
+
+
+QUERY_LOG_ENV = "BOT_HELP_QUERY_LOG"
+ENGINE_STAGES = ("exact", "lookup", "format", "scan")
+
+
+class QueryLog:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        self.queue = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self._write_entries, name="QueryLogWriter", daemon=True)
+        self.writer.start()
+
+    def record(self, query, source, bank, max_results, context_lines, trace, timings=None):
+        self.queue.put((time.time(), query, source, bank, max_results, context_lines, trace, timings))
+
+    def _write_entries(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            lines = [self._format(*item)]
+            # Write whatever else is already queued in the same flush
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.queue.put(None)
+                    break
+                lines.append(self._format(*item))
+            self.file.write("".join(lines))
+            self.file.flush()
+        self.file.close()
+
+    @staticmethod
+    def _format(timestamp, query, source, bank, max_results, context_lines, trace, timings):
+        entry = {
+            "t": round(timestamp, 3),
+            "src": source,
+            "bank": os.path.basename(bank),
+            "k": max_results,
+            "c": context_lines,
+            "q": bank_index.normalize_text(query),
+            "raw": query,
+            "ids": trace.get("ids", []),
+            "ms": dict(trace.get("ms", {})),
+        }
+        for stage, seconds in (timings or {}).items():
+            entry["ms"][stage] = round(seconds * 1000, 4)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def close(self):
+        """Write out queued entries and stop the writer thread"""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+
+
+_query_log = None
+_query_log_lock = threading.Lock()
+
+
+def get_query_log():
+    """Return the shared QueryLog if BOT_HELP_QUERY_LOG is set, else None"""
+    global _query_log
+    path = os.environ.get(QUERY_LOG_ENV)
+    if not path:
+        return None
+    with _query_log_lock:
+        if _query_log is None:
+            _query_log = QueryLog(path)
+            atexit.register(_query_log.close)
+        return _query_log
+
+
+def read_query_log(path):
+    """Yield the entries of a recorded query log"""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def engine_ms(entry):
+    """Time the recorded lookup spent inside the search engine"""
+    return sum(entry["ms"].get(stage, 0.0) for stage in ENGINE_STAGES)
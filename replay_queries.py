@@ -0,0 +1,86 @@
+"""Replay a recorded query log against the current search engine.
+
+    BOT_HELP_QUERY_LOG=queries.jsonl python main.py     # record
+    python replay_queries.py queries.jsonl              # replay headlessly
+    python replay_queries.py queries.jsonl --bank merged.txt --repeat 5
+
+Every recorded lookup is run again through bank_index.search_many() with its
+original selection, bank and limits. The report compares result ids with the
+recording and engine latency percentiles, recorded vs replayed. Exits with
+status 1 if any result differs.
+"""
+import argparse
+import statistics
+import sys
+
+import bank_index
+import query_log
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def replay(entries, bank=None, repeat=1):
+    """Yield (entry, replayed ids, best engine time in ms) per entry.
+
+    Times are summed over the same engine stages as the recording, so both
+    columns leave out index loading and call overhead.
+    """
+    for entry in entries:
+        path = bank or entry["bank"]
+        best = None
+        for _ in range(repeat):
+            traces = []
+            # Logs written before "raw" was recorded only have the normalized query
+            bank_index.search_many([entry.get("raw", entry["q"])], path, entry.get("k"), entry.get("c", 4), traces)
+            elapsed = query_log.engine_ms(traces[0])
+            best = elapsed if best is None else min(best, elapsed)
+        yield entry, traces[0]["ids"], best
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded lookups and compare results and latency")
+    parser.add_argument("log", help="query log recorded with BOT_HELP_QUERY_LOG")
+    parser.add_argument("--bank", help="search this bank instead of the recorded one")
+    parser.add_argument("--repeat", type=positive_int, default=1, help="runs per query; the fastest is kept")
+    parser.add_argument("--show", type=int, default=10, help="result mismatches to print")
+    args = parser.parse_args(argv)
+
+    entries = list(query_log.read_query_log(args.log))
+    if not entries:
+        print(f"{args.log}: no recorded queries", file=sys.stderr)
+        return 1
+    for path in {args.bank or entry["bank"] for entry in entries}:
+        bank_index.load_index(path)
+
+    recorded, replayed, mismatches = [], [], []
+    for entry, ids, elapsed in replay(entries, args.bank, args.repeat):
+        recorded.append(query_log.engine_ms(entry))
+        replayed.append(elapsed)
+        if ids != entry["ids"]:
+            mismatches.append((entry, ids))
+
+    for entry, ids in mismatches[:args.show]:
+        print(f"MISMATCH {entry['q'][:60]!r}: recorded {entry['ids']} replayed {ids}")
+
+    print(f"{len(entries)} queries, {len(entries) - len(mismatches)} identical results, {len(mismatches)} different")
+    print(f"{'engine ms':<10} {'p50':>9} {'p95':>9} {'p99':>9} {'mean':>9}")
+    for label, values in (("recorded", recorded), ("replayed", replayed)):
+        print(
+            f"{label:<10} {percentile(values, 0.5):9.3f} {percentile(values, 0.95):9.3f} "
+            f"{percentile(values, 0.99):9.3f} {statistics.fmean(values):9.3f}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
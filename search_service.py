@@ -0,0 +1,273 @@
+"""Headless query server and the thin client used by the front ends.
+
+Run ``python search_service.py mb.txt kte.txt`` (or ``python main.py serve``)
+to load the bank indexes once and answer queries over localhost HTTP:
+
+    POST /search  {"bank": "mb.txt", "queries": ["..."], "max_results": 4}
+    ->            {"results": [["snippet", ...], ...]}
+                  with "trace": true, also "traces": [{"ids", "ms"}, ...]
+    GET  /health  -> {"banks": ["mb.txt", ...]}
+
+Connections are HTTP/1.1 keep-alive, so a front end pays the connect cost once.
+Front ends find the server through the BOT_HELP_SERVER environment variable
+("host:port") and search in-process when it is unset or unreachable.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bank_index
+import log_setup
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SERVER_ENV = "BOT_HELP_SERVER"
+CLIENT_TIMEOUT = 2.0
+# Large enough for a batch of thousands of questions
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACK adds ~40 ms to every keep-alive round trip.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"banks": sorted(self.server.banks)})
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def parse_search(self, request):
+        """Validate a /search body; return (queries, bank path, max_results, context_lines)"""
+        if not isinstance(request, dict):
+            raise TypeError("body must be a JSON object")
+        queries = request.get("queries")
+        if queries is None:
+            queries = [request["query"]]
+        if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+            raise TypeError("queries must be a list of strings")
+        bank = request.get("bank") or self.server.default_bank
+        if not isinstance(bank, str):
+            raise TypeError("bank must be a string")
+        path = self.server.banks[bank]
+        max_results = request.get("max_results")
+        context_lines = request.get("context_lines", 4)
+        if max_results is not None and not _is_count(max_results):
+            raise TypeError("max_results must be a non-negative integer or null")
+        if not _is_count(context_lines):
+            raise TypeError("context_lines must be a non-negative integer")
+        return queries, path, max_results, context_lines
+
+    def do_POST(self):
+        if self.path != "/search":
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_REQUEST_BYTES:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self.send_json(400, {"error": f"Invalid Content-Length: {self.headers.get('Content-Length')}"})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            queries, path, max_results, context_lines = self.parse_search(request)
+        except KeyError as e:
+            self.send_json(400, {"error": f"Missing or unknown field: {e}"})
+            return
+        except (TypeError, ValueError) as e:
+            self.send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        traces = [] if request.get("trace") else None
+        try:
+            results = bank_index.search_many(queries, path, max_results, context_lines, traces)
+        except OSError as e:
+            logger.error(f"Error reading bank {path}: {e}")
+            self.send_json(500, {"error": str(e)})
+            return
+        response = {"results": results}
+        if traces is not None:
+            response["traces"] = traces
+        self.send_json(200, response)
+
+
+def create_server(bank_paths, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Load every bank index up front and return a ready, unstarted server"""
+    server = ThreadingHTTPServer((host, port), SearchRequestHandler)
+    server.daemon_threads = True
+    server.banks = {}
+    for path in bank_paths:
+        bank_index.load_index(path)
+        server.banks[os.path.basename(path)] = path
+    server.default_bank = os.path.basename(bank_paths[0])
+    return server
+
+
+def serve(bank_paths, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = create_server(bank_paths, host, port)
+    logger.info(f"Serving {', '.join(server.banks)} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server interrupted")
+    finally:
+        server.server_close()
+
+
+class SearchClient:
+    """Keep-alive JSON client for a running search server"""
+
+    def __init__(self, address, timeout=CLIENT_TIMEOUT):
+        host, _, port = address.rpartition(":")
+        self.host = host or DEFAULT_HOST
+        self.port = int(port)
+        self.timeout = timeout
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        with self.lock:
+            # One retry covers a keep-alive connection the server has since closed
+            for attempt in range(2):
+                if self.connection is None:
+                    self.connection = http.client.HTTPConnection(
+                        self.host, self.port, timeout=self.timeout
+                    )
+                try:
+                    self.connection.request(method, path, body, headers)
+                    response = self.connection.getresponse()
+                    data = json.loads(response.read())
+                    break
+                except (OSError, http.client.HTTPException):
+                    self.connection.close()
+                    self.connection = None
+                    if attempt:
+                        raise
+        if response.status != 200:
+            raise RuntimeError(data.get("error", f"HTTP {response.status}"))
+        return data
+
+    def search_many(self, queries, bank=None, max_results=None, context_lines=4, traces=None):
+        payload = {
+            "bank": bank,
+            "queries": list(queries),
+            "max_results": max_results,
+            "context_lines": context_lines,
+            "trace": traces is not None,
+        }
+        response = self.request("POST", "/search", payload)
+        if traces is not None:
+            traces.extend(response["traces"])
+        return response["results"]
+
+    def search(self, query, bank=None, max_results=None, context_lines=4, trace=None):
+        traces = [] if trace is not None else None
+        results = self.search_many([query], bank, max_results, context_lines, traces)
+        if trace is not None:
+            trace.update(traces[0])
+        return results[0]
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+_client = None
+_client_lock = threading.Lock()
+_invalid_addresses = set()
+
+
+def get_client():
+    """Return the shared client if BOT_HELP_SERVER is a valid address, else None"""
+    global _client
+    address = os.environ.get(SERVER_ENV)
+    if not address:
+        return None
+    with _client_lock:
+        if _client is None:
+            try:
+                _client = SearchClient(address)
+            except ValueError:
+                # Warn once, then keep searching in-process
+                if address not in _invalid_addresses:
+                    _invalid_addresses.add(address)
+                    logger.warning(f"Ignoring {SERVER_ENV}={address!r}: expected host:port")
+                return None
+        return _client
+
+
+def search(keyword, path, max_results=None, context_lines=4, trace=None):
+    """Search through the server when configured, in-process otherwise"""
+    client = get_client()
+    if client is not None:
+        try:
+            return client.search(keyword, os.path.basename(path), max_results, context_lines, trace)
+        except (OSError, RuntimeError, http.client.HTTPException, ValueError) as e:
+            logger.warning(f"Search server unavailable ({e}), searching locally")
+    return bank_index.search(keyword, path, max_results, context_lines, trace)
+
+
+def warm_up(path):
+    """Open the server connection if configured, otherwise build the local index"""
+    client = get_client()
+    if client is not None:
+        try:
+            client.request("GET", "/health")
+            return
+        except (OSError, RuntimeError, http.client.HTTPException, ValueError) as e:
+            logger.warning(f"Search server unavailable ({e}), indexing locally")
+    bank_index.load_index(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve question bank lookups over localhost HTTP")
+    parser.add_argument("banks", nargs="*", default=["mb.txt"], help="bank files to load")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    log_setup.configure_logging()
+    for path in args.banks:
+        if not bank_index.is_available(path):
+            logger.error(f"File not found: {path}")
+            return 1
+    serve(args.banks, args.host, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import math
+import time
+
+
+# A release counts as a drag selection if the pointer travelled at least
+# MIN_DRAG_DISTANCE pixels while held for at least MIN_DRAG_SECONDS.
+MIN_DRAG_DISTANCE = 10
+MIN_DRAG_SECONDS = 0.08
+# Clicks less than MIN_DRAG_DISTANCE apart, each within MULTI_CLICK_SECONDS of
+# the previous one, form a click run. Its second and third clicks (double-click
+# word, triple-click line, which replaces it) are selections; any further
+# clicks in the run are dropped as a burst.
+MULTI_CLICK_SECONDS = 0.4
+MAX_CLICK_RUN = 3
+
+
+class SelectionFilter:
+    """Decides which mouse releases end a selection worth copying.
+
+    Plain single clicks, synthetic clicks and click bursts are dropped here, so
+    the Ctrl+C / clipboard / search round trip only runs for drags and for
+    double and triple clicks. Every accepted selection is reported, so a newer
+    selection always replaces the result of an older one.
+    """
+
+    def __init__(
+        self,
+        button=None,
+        min_distance=MIN_DRAG_DISTANCE,
+        min_seconds=MIN_DRAG_SECONDS,
+        multi_click_seconds=MULTI_CLICK_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.button = button
+        self.min_distance = min_distance
+        self.min_seconds = min_seconds
+        self.multi_click_seconds = multi_click_seconds
+        self.clock = clock
+        self.press = None
+        self.last_click = None
+        self.click_count = 0
+        self.ignore_until = None
+        self.releases = 0
+        self.accepted = 0
+
+    def ignore_next_click(self):
+        """Drop a click released soon after this call, e.g. a synthetic one"""
+        self.ignore_until = self.clock() + self.multi_click_seconds
+
+    def on_press(self, x, y, button):
+        if self.button is None or button == self.button:
+            self.press = (x, y, self.clock())
+
+    def on_release(self, x, y, button):
+        """Return True if this release ends a selection that should be copied"""
+        if self.button is not None and button != self.button:
+            return False
+        self.releases += 1
+        press, self.press = self.press, None
+        if press is None:
+            return False
+
+        now = self.clock()
+        start_x, start_y, start_time = press
+        if math.hypot(x - start_x, y - start_y) >= self.min_distance:
+            self.last_click = None
+            if now - start_time < self.min_seconds:
+                return False
+            return self.accept()
+
+        ignore_until, self.ignore_until = self.ignore_until, None
+        if ignore_until is not None and now <= ignore_until:
+            self.last_click = None
+            return False
+        previous, self.last_click = self.last_click, (x, y, now)
+        if (
+            previous is not None
+            and now - previous[2] <= self.multi_click_seconds
+            and math.hypot(x - previous[0], y - previous[1]) < self.min_distance
+        ):
+            self.click_count += 1
+        else:
+            self.click_count = 1
+        return 1 < self.click_count <= MAX_CLICK_RUN and self.accept()
+
+    def accept(self):
+        self.accepted += 1
+        return True
+
+    def summary(self):
+        return f"{self.accepted} selection(s) out of {self.releases} mouse release(s)"
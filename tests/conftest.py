@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+SAMPLE_BANK = """﻿SELECT operatori nima uchun ishlatiladi?
+====
+#Ma’lumotlarni tanlash uchun
+====
+Ma’lumotlarni o‘chirish uchun
+
++++++
+
+Jadvaldagi qatorni o‘zgartirish buyrug‘i qaysi?
+====
+#UPDATE
+====
+DELETE
+
++++++
+
+Jadvaldagi qatorni o‘zgartirish buyrug‘i qaysi?
+====
+#UPDATE
+====
+DELETE
+
++++++
+
+MIN() funksiyasi nimani qaytaradi?
+====
+#Eng kichik qiymatni
+====
+Eng katta qiymatni
+"""
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / "sample.txt"
+    path.write_text(SAMPLE_BANK, encoding="utf-8")
+    return str(path)
@@ -0,0 +1,14 @@
+import answer_key
+
+
+def test_round_trip(tmp_path, bank_path):
+    answers = answer_key.collect_answers([bank_path])
+    assert len(answers) == 3
+
+    path = str(tmp_path / "answers.key")
+    answer_key.write_answer_key(answers, path)
+    key = answer_key.AnswerKey(path)
+    assert len(key) == 3
+    assert key.get("jadvaldagi  qatorni o'zgartirish buyrug'i qaysi?") == "UPDATE"
+    assert key.get("MIN() funksiyasi nimani qaytaradi?") == "Eng kichik qiymatni"
+    assert key.get("MIN() funksiyasi") is None
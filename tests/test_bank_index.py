@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+import bank_index
+from conftest import SAMPLE_BANK
+
+
+@pytest.fixture
+def index():
+    return bank_index.BankIndex(SAMPLE_BANK)
+
+
+def test_normalize_text():
+    assert bank_index.normalize_text("  O‘ZGARTIRISH\n\tbuyrug`i ") == "o'zgartirish buyrug'i"
+
+
+def test_parse_bank(index):
+    records = bank_index.parse_bank(SAMPLE_BANK)
+    assert len(records) == len(index) == 4
+    assert records[0].question == "SELECT operatori nima uchun ishlatiladi?"
+    assert records[0].options == ["#Ma’lumotlarni tanlash uchun", "Ma’lumotlarni o‘chirish uchun"]
+    assert records[0].answer == 0
+    assert index.record(3) == records[3]
+
+
+def test_lookup_partial_and_mid_word(index):
+    assert index.lookup("operatori nima") == [0]
+    assert index.lookup("LECT opera") == [0]
+    assert index.lookup("qatorni o'zgartirish") == [1]
+
+
+def test_lookup_collapses_identical_records(index):
+    # Records 1 and 2 have the same question and answer
+    assert index.lookup("buyrug‘i qaysi") == [1]
+    assert index.lookup_exact("Jadvaldagi qatorni o‘zgartirish buyrug‘i qaysi?") == [1]
+
+
+def test_lookup_misses(index):
+    assert index.lookup("") == []
+    assert index.lookup("not in the bank") == []
+    assert index.lookup_exact("MIN() funksiyasi") == []
+
+
+def test_lookup_limit(index):
+    assert index.lookup("i", limit=2) == [0, 1]
+
+
+def test_answer(index):
+    assert index.answer(1) == "UPDATE"
+    assert index.answer(3) == "Eng kichik qiymatni"
+
+
+def test_search_many_fallback_order(bank_path):
+    traces = []
+    results = bank_index.search_many(
+        [
+            "MIN() funksiyasi nimani qaytaradi?",
+            "SELECT operatori nima uchun ishlatiladi?\n====\n#Ma’lumotlarni tanlash uchun",
+            "Eng katta qiymatni",
+            "zzz",
+        ],
+        bank_path,
+        max_results=4,
+        context_lines=0,
+        traces=traces,
+    )
+    assert [trace["ids"] for trace in traces] == [["r3"], ["r0"], ["l28"], []]
+    assert results[0] == ["MIN() funksiyasi nimani qaytaradi?\n#Eng kichik qiymatni\nEng katta qiymatni"]
+    assert results[2] == ["Eng katta qiymatni"]
+    assert results[3] == []
+    assert "scan" not in traces[0]["ms"] and "scan" in traces[2]["ms"]
+
+
+def test_scan_lines(index):
+    (matches,) = index.scan_lines(["ENG KATTA"], context_lines=1)
+    assert matches == [(28, "Eng katta qiymatni")]
+    (matches,) = index.scan_lines(["delete"], context_lines=1, limit=1)
+    assert matches == [(12, "DELETE\n")]
+    assert index.scan_lines(["UPDATE\n====", "zzz"], context_lines=4) == [[], []]
+
+
+def test_index_file_round_trip(tmp_path, index):
+    index.source_signature = (123, 456)
+    path = str(tmp_path / "bank.idx")
+    bank_index.save_indexes({"sample.txt": index}, path)
+    loaded = bank_index.read_indexes(path)["sample.txt"]
+    for attr in ("data", "field_offsets", "answers", "canonical", "text", "suffixes", "exact_records"):
+        assert getattr(loaded, attr) == getattr(index, attr)
+    assert loaded.source_signature == (123, 456)
+    assert loaded.lookup("LECT opera") == [0]
+
+
+def test_read_indexes_rejects_bad_files(tmp_path, index):
+    path = str(tmp_path / "bank.idx")
+    with open(path, "wb") as file:
+        file.write(b"\x80\x05not an index")
+    with pytest.raises(ValueError):
+        bank_index.read_indexes(path)
+
+    bank_index.save_indexes({"sample.txt": index}, path)
+    with open(path, "r+b") as file:
+        file.truncate(100)
+    with pytest.raises(ValueError):
+        bank_index.read_indexes(path)
+
+
+def test_load_index_build_cache(bank_path):
+    index = bank_index.load_index(bank_path)
+    assert os.path.exists(bank_path + bank_index.INDEX_SUFFIX)
+    assert bank_index.load_index(bank_path) is index
+
+    # A corrupt cache is rebuilt, not trusted
+    bank_index._index_cache.clear()
+    with open(bank_path + bank_index.INDEX_SUFFIX, "wb") as file:
+        file.write(b"garbage")
+    assert len(bank_index.load_index(bank_path)) == 4
+
+
+def test_load_index_missing_bank(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        bank_index.load_index(str(tmp_path / "missing.txt"))
+
+
+def test_scan_lines_folds_non_ascii_case():
+    index = bank_index.BankIndex("Savol?\n====\n#ЭКРАН Öl\n====\nİSTANBUL\n")
+    assert index.scan_lines(["экран öl"], context_lines=0) == [[(2, "#ЭКРАН Öl")]]
+    assert index.scan_lines(["istanbul"], context_lines=0) == [[]]
+    assert index.scan_lines(["İstanbul"], context_lines=0) == [[(4, "İSTANBUL")]]
+    assert index.scan_lines([""], context_lines=0, limit=None)[0][-1] == (4, "İSTANBUL")
@@ -0,0 +1,52 @@
+import bank_index
+import dedupe_banks
+
+
+QUESTION = "TCP/IP protokollari stekining birinchi sathi qanday nomlanadi?"
+
+
+def record(question, options, answer=0):
+    return bank_index.Record(question, options, answer)
+
+
+def test_find_clusters():
+    texts = [QUESTION, QUESTION.replace("?", " ?"), "MIN() funksiyasi nimani qaytaradi?", "Boshqa savol"]
+    clusters = dedupe_banks.find_clusters([dedupe_banks.shingles(text) for text in texts])
+    assert clusters == [[0, 1]]
+
+
+def test_find_clusters_groups_equal_keys():
+    shingle_sets = [dedupe_banks.shingles(text) for text in ("aaaaaaa", "bbbbbbb", "ccccccc")]
+    assert dedupe_banks.find_clusters(shingle_sets, keys=[1, 2, 1]) == [[0, 2]]
+
+
+def test_options_key_ignores_order_and_marker():
+    first = record(QUESTION, ["#Tarmoq sathi", "Amaliy sath"])
+    second = record(QUESTION, ["amaliy  sath", "#tarmoq sathi"], answer=1)
+    assert dedupe_banks.options_key(first) == dedupe_banks.options_key(second)
+
+
+def write_bank(path, records):
+    path.write_text(dedupe_banks.format_bank(records), encoding="utf-8")
+    return str(path)
+
+
+def test_merge_near(tmp_path):
+    options = ["MIN()", "#MAX()", "AVG()"]
+    records = [
+        record("Ustundagi eng katta qiymatni qaytaruvchi funksiya qaysi?", options, 1),
+        record("Ustundagi eng katta qiymatni qaytaruvchi funksiya qaysi ?", list(reversed(options)), 1),
+        record("Ustundagi eng kichik qiymatni qaytarmaydigan funksiya qaysi?", options, 1),
+        record("Ustundagi eng katta qiymatni qaytaruvchi funksiya qaysi?", options, 1),
+    ]
+    bank = write_bank(tmp_path / "bank.txt", records)
+
+    output = str(tmp_path / "exact.txt")
+    dedupe_banks.main([bank, "--output", output])
+    assert len(bank_index.parse_bank(open(output, encoding="utf-8").read())) == 3
+
+    output = str(tmp_path / "near.txt")
+    dedupe_banks.main([bank, "--merge-near", "--output", output])
+    kept = bank_index.parse_bank(open(output, encoding="utf-8").read())
+    # The reworded copy goes; the different question with the same answer stays
+    assert [r.question for r in kept] == [records[0].question, records[2].question]
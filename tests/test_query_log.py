@@ -0,0 +1,29 @@
+import bank_index
+import query_log
+import replay_queries
+
+
+SELECTIONS = [
+    "SELECT operatori nima uchun ishlatiladi?\n====\n#Ma’lumotlarni tanlash uchun",
+    "Ma’lumotlarni O‘CHIRISH",
+    "Eng   katta",
+    "LECT opera",
+]
+
+
+def test_replay_matches_recording(tmp_path, bank_path):
+    path = str(tmp_path / "queries.jsonl")
+    log = query_log.QueryLog(path)
+    for selection in SELECTIONS:
+        trace = {}
+        bank_index.search(selection, bank_path, 4, 4, trace)
+        log.record(selection, "clipboard", bank_path, 4, 4, trace, {"copy": 0.1})
+    log.close()
+
+    entries = list(query_log.read_query_log(path))
+    assert [entry["raw"] for entry in entries] == SELECTIONS
+    assert entries[1]["q"] == "ma'lumotlarni o'chirish"
+    assert entries[0]["ms"]["copy"] == 100.0
+
+    # The recorded bank name is resolved from the working directory
+    assert replay_queries.main([path, "--bank", bank_path]) == 0
@@ -0,0 +1,80 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import search_service
+from conftest import SAMPLE_BANK
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    path = tmp_path_factory.mktemp("server") / "sample.txt"
+    path.write_text(SAMPLE_BANK, encoding="utf-8")
+    server = search_service.create_server([str(path)], port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    connection.request("POST", "/search", body, {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    connection.close()
+    return response.status, data
+
+
+def test_client_round_trip(server):
+    client = search_service.SearchClient(f"127.0.0.1:{server.server_port}")
+    traces = []
+    results = client.search_many(["LECT opera", "zzz"], "sample.txt", 4, 4, traces)
+    client.close()
+    assert len(results[0]) == 1 and results[0][0].startswith("SELECT operatori")
+    assert results[1] == []
+    assert [trace["ids"] for trace in traces] == [["r0"], []]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "[1]",
+        "not json",
+        '{"queries": "abc"}',
+        '{"queries": ["x", 1]}',
+        '{"queries": ["x"], "max_results": "4"}',
+        '{"queries": ["x"], "max_results": true}',
+        '{"queries": ["x"], "context_lines": null}',
+        '{"queries": ["x"], "bank": "other.txt"}',
+        "{}",
+    ],
+)
+def test_invalid_requests_get_400(server, body):
+    status, data = post(server, body)
+    assert status == 400
+    assert "error" in data
+
+
+@pytest.mark.parametrize("length", ["-1", "abc", str(search_service.MAX_REQUEST_BYTES + 1)])
+def test_invalid_content_length_gets_400(server, length):
+    with socket.create_connection(("127.0.0.1", server.server_port), timeout=5) as connection:
+        connection.sendall(f"POST /search HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode())
+        assert connection.recv(1024).startswith(b"HTTP/1.1 400")
+
+
+def test_search_falls_back_to_local(monkeypatch, bank_path):
+    monkeypatch.setattr(search_service, "_client", search_service.SearchClient("127.0.0.1:1"))
+    monkeypatch.setenv(search_service.SERVER_ENV, "127.0.0.1:1")
+    assert len(search_service.search("LECT opera", bank_path)) == 1
+
+
+def test_malformed_server_address_searches_locally(monkeypatch, bank_path):
+    monkeypatch.setattr(search_service, "_client", None)
+    monkeypatch.setenv(search_service.SERVER_ENV, "localhost")
+    assert search_service.get_client() is None
+    assert len(search_service.search("LECT opera", bank_path)) == 1
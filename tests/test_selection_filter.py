@@ -0,0 +1,88 @@
+import pytest
+
+from selection_filter import SelectionFilter
+
+
+LEFT = "left"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def selection_filter(clock):
+    return SelectionFilter(button=LEFT, clock=clock)
+
+
+def release(selection_filter, clock, start, end, held=0.05, after=1.0, button=LEFT):
+    clock.now += after
+    selection_filter.on_press(*start, button)
+    clock.now += held
+    return selection_filter.on_release(*end, button)
+
+
+def test_drag_is_a_selection(selection_filter, clock):
+    assert release(selection_filter, clock, (0, 0), (100, 0), held=0.2)
+
+
+def test_short_or_fast_moves_are_not(selection_filter, clock):
+    assert not release(selection_filter, clock, (0, 0), (5, 0), held=0.2)
+    assert not release(selection_filter, clock, (0, 0), (100, 0), held=0.02)
+
+
+def test_other_buttons_are_ignored(selection_filter, clock):
+    assert not release(selection_filter, clock, (0, 0), (100, 0), held=0.2, button="right")
+
+
+def test_newer_drag_replaces_older_one(selection_filter, clock):
+    assert release(selection_filter, clock, (0, 0), (100, 0), held=0.2)
+    assert release(selection_filter, clock, (0, 20), (80, 20), held=0.1, after=0.05)
+
+
+def test_single_click_is_not_a_selection(selection_filter, clock):
+    assert not release(selection_filter, clock, (5, 5), (5, 5))
+    assert not release(selection_filter, clock, (5, 5), (5, 5), after=1.0)
+
+
+def test_double_and_triple_click(selection_filter, clock):
+    assert not release(selection_filter, clock, (5, 5), (5, 5))
+    assert release(selection_filter, clock, (5, 5), (5, 5), after=0.1)
+    assert release(selection_filter, clock, (6, 5), (6, 5), after=0.1)
+
+
+@pytest.mark.parametrize("clicks", [4, 5])
+def test_click_burst_fires_at_most_double_and_triple(selection_filter, clock, clicks):
+    accepted = [release(selection_filter, clock, (5, 5), (5, 5), after=0.1) for _ in range(clicks)]
+    assert accepted == [False, True, True] + [False] * (clicks - 3)
+
+
+def test_clicks_apart_are_not_a_run(selection_filter, clock):
+    assert not release(selection_filter, clock, (5, 5), (5, 5))
+    assert not release(selection_filter, clock, (50, 50), (50, 50), after=0.1)
+    assert not release(selection_filter, clock, (50, 50), (50, 50), after=0.5)
+
+
+def test_ignored_synthetic_click(selection_filter, clock):
+    release(selection_filter, clock, (5, 5), (5, 5))
+    assert release(selection_filter, clock, (5, 5), (5, 5), after=0.1)
+    selection_filter.ignore_next_click()
+    assert not release(selection_filter, clock, (5, 5), (5, 5), held=0.0, after=0.1)
+    assert not release(selection_filter, clock, (5, 5), (5, 5), after=0.1)
+
+
+def test_ignore_expires(selection_filter, clock):
+    selection_filter.ignore_next_click()
+    clock.now += 5
+    release(selection_filter, clock, (5, 5), (5, 5))
+    assert release(selection_filter, clock, (5, 5), (5, 5), after=0.1)
+    assert selection_filter.summary() == "1 selection(s) out of 2 mouse release(s)"